@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Headless batch runner: bakes metaball meshes to binary STL without Fusion 360.
+
+Reads a list of parameter sets (JSONL or CSV), runs the layout + marching cubes
+pipeline for each one in a process pool and writes a summary report with
+per-job timings.
+
+Usage:
+    python batch.py variants.jsonl -o out/ --workers 8
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import re
+import struct
+import sys
+import time
+
+from lib.marching import _layout_positions, _marching_cubes, _metaball_bounds
+
+# Same defaults as the command dialog in Metaballs.py (lengths in cm).
+DEFAULTS = {
+    'count': 6,
+    'radius': 2.0,
+    'spacing': 1.2,
+    'layout': 'Línea',
+    'threshold': 1.0,
+    'grid': 28,
+}
+
+LAYOUT_ALIASES = {
+    'linea': 'Línea',
+    'línea': 'Línea',
+    'line': 'Línea',
+    'circulo': 'Círculo',
+    'círculo': 'Círculo',
+    'circle': 'Círculo',
+}
+
+SUMMARY_NAME = 'summary.json'
+
+
+def _normalize_job(raw, index):
+    params = dict(DEFAULTS)
+    for key in DEFAULTS:
+        value = raw.get(key)
+        if value is None or value == '':
+            continue
+        params[key] = value
+
+    params['count'] = int(params['count'])
+    params['grid'] = int(params['grid'])
+    params['radius'] = float(params['radius'])
+    params['spacing'] = float(params['spacing'])
+    params['threshold'] = float(params['threshold'])
+
+    layout = LAYOUT_ALIASES.get(str(params['layout']).strip().lower())
+    if layout is None:
+        raise ValueError('Job {}: unknown layout {!r}'.format(index, params['layout']))
+    params['layout'] = layout
+
+    if params['count'] < 1:
+        raise ValueError('Job {}: count must be >= 1'.format(index))
+    if params['grid'] < 2:
+        raise ValueError('Job {}: grid must be >= 2'.format(index))
+    if params['radius'] <= 0:
+        raise ValueError('Job {}: radius must be > 0'.format(index))
+
+    name = raw.get('name') or 'variant_{:04d}'.format(index)
+    params['name'] = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name))
+    return params
+
+
+def _read_jobs(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    jobs = [_normalize_job(row, index) for index, row in enumerate(rows)]
+    names = [job['name'] for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError('Duplicate job names: {}'.format(', '.join(duplicates)))
+    return jobs
+
+
+def _write_binary_stl(path, vertices, triangles, header):
+    with open(path, 'wb') as f:
+        f.write(header.encode('ascii', 'replace')[:80].ljust(80, b'\0'))
+        f.write(struct.pack('<I', len(triangles)))
+        pack = struct.Struct('<12fH').pack
+        for a, b, c in triangles:
+            va, vb, vc = vertices[a], vertices[b], vertices[c]
+            ux, uy, uz = vb[0] - va[0], vb[1] - va[1], vb[2] - va[2]
+            wx, wy, wz = vc[0] - va[0], vc[1] - va[1], vc[2] - va[2]
+            nx = uy * wz - uz * wy
+            ny = uz * wx - ux * wz
+            nz = ux * wy - uy * wx
+            length = (nx * nx + ny * ny + nz * nz) ** 0.5
+            if length > 0.0:
+                nx, ny, nz = nx / length, ny / length, nz / length
+            f.write(pack(nx, ny, nz, *va, *vb, *vc, 0))
+
+
+def _run_job(params, output_dir):
+    result = {'name': params['name'], 'params': params}
+    start = time.perf_counter()
+    try:
+        centers = _layout_positions(params['count'], params['radius'], params['spacing'], params['layout'])
+        metaballs = [(center, params['radius']) for center in centers]
+        bounds = _metaball_bounds(params['count'], params['radius'], params['spacing'])
+
+        mesh_start = time.perf_counter()
+        vertices, triangles = _marching_cubes(metaballs, bounds, params['grid'], params['threshold'])
+        mesh_time = time.perf_counter() - mesh_start
+        if not vertices:
+            raise RuntimeError('No mesh generated, adjust threshold or grid.')
+
+        path = os.path.join(output_dir, params['name'] + '.stl')
+        write_start = time.perf_counter()
+        _write_binary_stl(path, vertices, triangles, 'Metaballs {} (cm)'.format(params['name']))
+        write_time = time.perf_counter() - write_start
+
+        result.update({
+            'status': 'ok',
+            'path': path,
+            'triangles': len(triangles),
+            'mesh_seconds': round(mesh_time, 4),
+            'write_seconds': round(write_time, 4),
+        })
+    except Exception as error:
+        result.update({'status': 'error', 'error': '{}: {}'.format(type(error).__name__, error)})
+    result['total_seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def run_batch(jobs, output_dir, workers=None, max_pending=None, progress=None):
+    """Run every job in a process pool, keeping at most max_pending jobs queued."""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max(max_pending or workers * 2, workers)
+
+    results = []
+    pending = set()
+    remaining = iter(jobs)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for params in remaining:
+                pending.add(pool.submit(_run_job, params, output_dir))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results.append(result)
+                if progress:
+                    progress(result, len(results), len(jobs))
+
+    order = {params['name']: index for index, params in enumerate(jobs)}
+    results.sort(key=lambda result: order[result['name']])
+    return results
+
+
+def _print_progress(result, finished, total):
+    if result['status'] == 'ok':
+        detail = '{} triangles, {:.2f} s'.format(result['triangles'], result['total_seconds'])
+    else:
+        detail = result['error']
+    print('[{}/{}] {} {}: {}'.format(finished, total, result['status'], result['name'], detail))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bake metaball variants to binary STL without Fusion 360.')
+    parser.add_argument('jobs', help='JSONL or CSV file with one parameter set per line/row')
+    parser.add_argument('-o', '--output', default='metaballs_out', help='output directory (default: %(default)s)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='max jobs queued in the pool at once (default: 2 x workers)')
+    args = parser.parse_args(argv)
+
+    jobs = _read_jobs(args.jobs)
+    start = time.perf_counter()
+    results = run_batch(jobs, args.output, args.workers, args.max_pending, _print_progress)
+    wall_time = time.perf_counter() - start
+
+    failed = [result for result in results if result['status'] != 'ok']
+    summary = {
+        'jobs': len(results),
+        'succeeded': len(results) - len(failed),
+        'failed': len(failed),
+        'wall_seconds': round(wall_time, 4),
+        'cpu_seconds': round(sum(result['total_seconds'] for result in results), 4),
+        'results': results,
+    }
+    summary_path = os.path.join(args.output, SUMMARY_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print('\n{} of {} jobs succeeded in {:.2f} s'.format(summary['succeeded'], summary['jobs'], wall_time))
+    print('Summary written to {}'.format(summary_path))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
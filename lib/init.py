@@ -1,4 +1,4 @@
-import adsk.core, adsk.fusion, math
+import adsk.core, adsk.fusion, math, time
 from .lib import fusion360utils as futil
 from . import config
 
@@ -22,6 +22,7 @@ def run(context):
             drop = inputs.addDropDownCommandInput('layout', 'Arreglo', 0)
             drop.listItems.add('Línea', True)
             drop.listItems.add('Círculo', False)
+            inputs.addBoolValueInput('fast', 'Sólido rápido (BRep)', True, '', True)
             
             args.command.execute.add(futil._EventHandler(command_execute))
 
@@ -40,17 +41,27 @@ def run(context):
             comp = occ.component
             comp.name = "Metaballs Group"
             
-            spheres = comp.features.sphereFeatures
+            centers = []
             for i in range(cnt):
                 if lay == 'Círculo':
                     angle = (2 * math.pi / cnt) * i
                     dist = (rad + spc) * cnt / (2 * math.pi)
-                    pt = adsk.core.Point3D.create(dist * math.cos(angle), dist * math.sin(angle), 0)
+                    centers.append(adsk.core.Point3D.create(dist * math.cos(angle), dist * math.sin(angle), 0))
                 else:
-                    pt = adsk.core.Point3D.create(i * (rad + spc), 0, 0)
-                
-                sph_inp = spheres.createInput(pt, adsk.core.ValueInput.createByReal(rad))
-                spheres.add(sph_inp)
+                    centers.append(adsk.core.Point3D.create(i * (rad + spc), 0, 0))
+
+            start = time.perf_counter()
+            if inputs.itemById('fast').value:
+                _create_fast_solid(design, comp, centers, rad)
+                mode = 'sólido rápido'
+            else:
+                spheres = comp.features.sphereFeatures
+                for pt in centers:
+                    sph_inp = spheres.createInput(pt, adsk.core.ValueInput.createByReal(rad))
+                    spheres.add(sph_inp)
+                mode = 'esferas'
+            elapsed = time.perf_counter() - start
+            app.userInterface.messageBox(f'{cnt} metaballs ({mode}) en {elapsed:.2f} s')
 
         # Registro del evento
         handler = futil._EventHandler(command_created)
@@ -65,6 +76,26 @@ def run(context):
     except:
         futil.handle_error('run')
 
+def _create_fast_solid(design, comp, centers, rad):
+    # Une todas las esferas como cuerpos temporales y crea un solo cuerpo,
+    # en lugar de un sphereFeature (y un recálculo) por bola.
+    tmp = adsk.fusion.TemporaryBRepManager.get()
+    body = None
+    for pt in centers:
+        sphere = tmp.createSphere(pt, rad)
+        if body is None:
+            body = sphere
+        else:
+            tmp.booleanOperation(body, sphere, adsk.fusion.BooleanTypes.UnionBooleanType)
+
+    if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        base = comp.features.baseFeatures.add()
+        base.startEdit()
+        comp.bRepBodies.add(body, base)
+        base.finishEdit()
+    else:
+        comp.bRepBodies.add(body)
+
 def stop(context):
     try:
         app = adsk.core.Application.get()